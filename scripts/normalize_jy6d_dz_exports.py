@@ -17,16 +17,76 @@ Goals:
 Usage:
   python scripts/normalize_jy6d_dz_exports.py
   python scripts/normalize_jy6d_dz_exports.py --in "scripts/data/jy6d-dz" --out "scripts/data/jy6d-dz/normalized"
+  python scripts/normalize_jy6d_dz_exports.py --jobs 1
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import functools
+import io
 import json
+import os
+import re
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json produces the same output, just slower
+    orjson = None
+
+
+_HAS_CJK = re.compile(r"[\u4e00-\u9fff]").search
+
+
+def _dumps_compact(obj: Dict[str, str]) -> str:
+    # Compact JSON with non-ASCII kept as-is (matches json.dumps(ensure_ascii=False, separators=(",", ":"))).
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# Characters that make csv.writer (excel dialect, QUOTE_MINIMAL) quote a field.
+_NEEDS_QUOTE = re.compile(r'[",\r\n]').search
+
+
+def _fast_csv_line(row: List[str]) -> Optional[str]:
+    """Format a normalized (english, chinese, id, extra_json) row like csv.writer would.
+
+    Returns None when the row is not eligible (other shape, or a quote/comma/newline
+    in the first three fields) so the caller can fall back to csv.writer.
+    """
+
+    if len(row) != 4:
+        return None
+    en, cn, sid, extra = row
+    if _NEEDS_QUOTE(en + cn + sid):
+        return None
+    if _NEEDS_QUOTE(extra):
+        extra = '"' + extra.replace('"', '""') + '"'
+    return f"{en},{cn},{sid},{extra}\r\n"
+
+
+def _fast_csv_matches_stdlib() -> bool:
+    # Checked once at import: if csv.writer ever formats these differently, don't use the fast path.
+    samples = [
+        ["a", "", "1", ""],
+        ["Game (U)", "游戏", "", '{"k":"v, \\"q\\""}'],
+        ["", "", "", "x\ny"],
+        ["", "", "", ""],
+    ]
+    buf = io.StringIO()
+    csv.writer(buf).writerows(samples)
+    return "".join(_fast_csv_line(r) or "" for r in samples) == buf.getvalue()
+
+
+_FAST_CSV = _fast_csv_matches_stdlib()
 
 
 def _read_csv(path: Path) -> Tuple[List[str], List[List[str]]]:
@@ -45,10 +105,18 @@ def _write_csv(path: Path, headers: List[str], rows: Iterable[List[str]]) -> Non
     with path.open("w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
         w.writerow(headers)
+        if not _FAST_CSV:
+            w.writerows(rows)
+            return
         for row in rows:
-            w.writerow(row)
+            line = _fast_csv_line(row)
+            if line is None:
+                w.writerow(row)
+            else:
+                f.write(line)
 
 
+@functools.lru_cache(maxsize=65536)
 def _attempt_mojibake_fix(s: str) -> str:
     """Try to repair common encoding-mismatch mojibake.
 
@@ -57,12 +125,14 @@ def _attempt_mojibake_fix(s: str) -> str:
     Reverse by encoding as GBK then decoding as UTF-8.
     """
 
-    if not s:
+    # Pure ASCII (most English-only rows) round-trips unchanged through every
+    # candidate encoding, so it can never be a fix.
+    if not s or s.isascii():
         return s
 
     ss = s.strip()
     # Quick exit: contains real Han characters already.
-    if any("\u4e00" <= ch <= "\u9fff" for ch in ss):
+    if _HAS_CJK(ss):
         return s
 
     # Try GBK->UTF8 reversal
@@ -71,7 +141,7 @@ def _attempt_mojibake_fix(s: str) -> str:
             b = ss.encode(enc)
             fixed = b.decode("utf-8")
             # Must introduce some CJK to be considered a fix
-            if any("\u4e00" <= ch <= "\u9fff" for ch in fixed):
+            if _HAS_CJK(fixed):
                 return fixed
         except Exception:
             pass
@@ -79,64 +149,88 @@ def _attempt_mojibake_fix(s: str) -> str:
     return s
 
 
-def _col_index(headers: List[str], candidates: List[str]) -> Optional[int]:
-    lower = [h.strip().lower() for h in headers]
-    for c in candidates:
-        cc = c.strip().lower()
-        if cc in lower:
-            return lower.index(cc)
-    return None
-
-
 def _pick_mapping_columns(headers: List[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    # Header name -> first column index with that name.
+    idx: Dict[str, int] = {}
+    for i, h in enumerate(headers):
+        idx.setdefault(h.strip().lower(), i)
+
+    def col(candidates: List[str]) -> Optional[int]:
+        for c in candidates:
+            i = idx.get(c.strip().lower())
+            if i is not None:
+                return i
+        return None
+
     # english, chinese, id
-    en_idx = _col_index(headers, [
+    en_idx = col([
         "english_name",
         "game_name",
         "英文名",
         "英文名称",
     ])
-    cn_idx = _col_index(headers, [
+    cn_idx = col([
         "chinese_name",
         "ch_name",
         "中文名",
         "中文名称",
     ])
-    id_idx = _col_index(headers, ["id", "game_id", "UMD_ID", "umd_id"])
+    id_idx = col(["id", "game_id", "UMD_ID", "umd_id"])
 
     # Special case: MD mapping-only output already has english_name/chinese_name
     return (en_idx, cn_idx, id_idx)
 
 
-def normalize_file(csv_path: Path, out_dir: Path) -> Tuple[str, int]:
+class _RowWriter(Protocol):
+    """Anything with csv.writer's `writerows`."""
+
+    def writerows(self, rows: Iterable[List[str]]) -> object:
+        ...
+
+
+def normalize_file(csv_path: Path, out_dir: Path, combined: Optional[_RowWriter] = None) -> Tuple[str, int]:
+    """Normalize one export into out_dir/{system}.csv.
+
+    If `combined` is given (typically the csv.writer for all.csv), each normalized
+    row is also passed to its `writerows` as [system, english_name, chinese_name,
+    source_id, extra_json], so all.csv is built in the same pass.
+    """
+
     system = csv_path.stem.lower()
     headers, rows = _read_csv(csv_path)
     if not headers:
         return (system, 0)
 
-    # Drop redundant system col if present as first header.
+    # Drop redundant system col if present as first header. Rows are left as read;
+    # column indices are shifted by `offset` instead of slicing every row.
+    offset = 0
     if headers and headers[0].strip().lower() == "system":
         headers = headers[1:]
-        rows = [r[1:] if len(r) > 0 else [] for r in rows]
+        offset = 1
 
     en_idx, cn_idx, id_idx = _pick_mapping_columns(headers)
 
     out_headers = ["english_name", "chinese_name", "source_id", "extra_json"]
     out_rows: List[List[str]] = []
 
+    # Columns not mapped to en/cn/id go into extra_json; resolve them once per file.
+    mapped = {en_idx, cn_idx, id_idx}
+    extra_cols = [(i + offset, h) for i, h in enumerate(headers) if i not in mapped]
+    if offset:
+        en_idx, cn_idx, id_idx = (i + offset if i is not None else None for i in (en_idx, cn_idx, id_idx))
+
     for r in rows:
-        rr = r + [""] * (len(headers) - len(r))
-        en = rr[en_idx].strip() if en_idx is not None and en_idx < len(rr) else ""
-        cn = rr[cn_idx].strip() if cn_idx is not None and cn_idx < len(rr) else ""
-        sid = rr[id_idx].strip() if id_idx is not None and id_idx < len(rr) else ""
+        # Short rows are not padded; every lookup below is bounds-checked instead.
+        n = len(r)
+        en = r[en_idx].strip() if en_idx is not None and en_idx < n else ""
+        cn = r[cn_idx].strip() if cn_idx is not None and cn_idx < n else ""
+        sid = r[id_idx].strip() if id_idx is not None and id_idx < n else ""
 
         cn = _attempt_mojibake_fix(cn)
 
         extra: Dict[str, str] = {}
-        for i, h in enumerate(headers):
-            if i in (en_idx, cn_idx, id_idx):
-                continue
-            v = rr[i].strip() if i < len(rr) else ""
+        for i, h in extra_cols:
+            v = r[i].strip() if i < n else ""
             if v:
                 extra[h] = v
 
@@ -144,18 +238,38 @@ def normalize_file(csv_path: Path, out_dir: Path) -> Tuple[str, int]:
             en,
             cn,
             sid,
-            json.dumps(extra, ensure_ascii=False, separators=(",", ":")) if extra else "",
+            _dumps_compact(extra) if extra else "",
         ])
 
     out_path = out_dir / f"{system}.csv"
     _write_csv(out_path, out_headers, out_rows)
+    if combined is not None:
+        combined.writerows([system, *row] for row in out_rows)
     return (system, len(out_rows))
 
 
+def _part_path(csv_path: Path, out_dir: Path) -> Path:
+    return out_dir / f".{csv_path.stem.lower()}.all.part"
+
+
+def _normalize_to_part(csv_path: Path, out_dir: Path) -> Tuple[str, int, Path]:
+    # Worker entry point: besides {system}.csv, write the all.csv-formatted rows to a
+    # part file so the parent process only has to concatenate them.
+    part_path = _part_path(csv_path, out_dir)
+    try:
+        with part_path.open("w", encoding="utf-8", newline="") as f:
+            system, count = normalize_file(csv_path, out_dir, csv.writer(f))
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return (system, count, part_path)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="in_dir", default="scripts/data/jy6d-dz", help="input dir")
     ap.add_argument("--out", dest="out_dir", default="scripts/data/jy6d-dz/normalized", help="output dir")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
     args = ap.parse_args()
 
     in_dir = Path(args.in_dir)
@@ -168,21 +282,34 @@ def main() -> int:
         return 2
 
     combined_headers = ["system", "english_name", "chinese_name", "source_id", "extra_json"]
-    combined_rows: List[List[str]] = []
-
-    for p in csv_files:
-        system, count = normalize_file(p, out_dir)
-        # Append to combined
-        norm_path = out_dir / f"{system}.csv"
-        with norm_path.open("r", encoding="utf-8", newline="") as f:
-            r = csv.reader(f)
-            next(r, None)
-            for row in r:
-                combined_rows.append([system, *row])
-        print(f"OK  {p.name} -> {system}.csv ({count} rows)")
-
-    _write_csv(out_dir / "all.csv", combined_headers, combined_rows)
-    print(f"DONE all.csv ({len(combined_rows)} rows)")
+    total = 0
+
+    jobs = max(1, min(args.jobs, len(csv_files)))
+
+    # Files are independent, so normalize them in parallel; results come back in input
+    # order, which keeps all.csv deterministic. all.csv is assembled under a temp name
+    # and only renamed into place once every file succeeded.
+    all_path = out_dir / "all.csv"
+    tmp_path = out_dir / ".all.csv.tmp"
+    try:
+        with tmp_path.open("w", encoding="utf-8", newline="") as f, \
+                ProcessPoolExecutor(max_workers=jobs) as pool:
+            csv.writer(f).writerow(combined_headers)
+            results = pool.map(_normalize_to_part, csv_files, [out_dir] * len(csv_files))
+            for p, (system, count, part_path) in zip(csv_files, results):
+                with part_path.open("r", encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, f)
+                part_path.unlink()
+                total += count
+                print(f"OK  {p.name} -> {system}.csv ({count} rows)")
+        os.replace(tmp_path, all_path)
+    finally:
+        # The pool has shut down by now, so no worker is still writing a part file.
+        for p in csv_files:
+            _part_path(p, out_dir).unlink(missing_ok=True)
+        tmp_path.unlink(missing_ok=True)
+
+    print(f"DONE all.csv ({total} rows)")
     return 0
 
 
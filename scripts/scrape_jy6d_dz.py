@@ -8,7 +8,8 @@ The site has per-platform pages (e.g. /dz/md/, /dz/psp/ ...) containing a
 "数据列表" table. This script downloads those tables and exports them as CSV.
 
 Design goals:
-- No third-party deps (stdlib only)
+- No third-party deps required (stdlib only); `lxml` is used to parse HTML
+  tables when it is installed
 - Resilient to different column sets (some pages have "编号/英文名/中文名",
   some have "中英对照/ROM名称", etc.)
 - Save UTF-8 CSV with headers
@@ -18,33 +19,192 @@ Examples:
   python scripts/scrape_jy6d_dz.py --system psp
   python scripts/scrape_jy6d_dz.py --all
   python scripts/scrape_jy6d_dz.py --all --outdir "data/jy6d-dz"
+  python scripts/scrape_jy6d_dz.py --all --workers 8 --delay 0.1
+  python scripts/scrape_jy6d_dz.py --list --refresh-index
 """
 
 from __future__ import annotations
 
 import argparse
+import codecs
 import csv
+import http.client
+import io
 import json
 import re
+import socket
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # optional: fall back to the stdlib HTMLParser
+    _lxml_etree = None
 
 
 # Note: the site is often reachable via HTTP but times out on HTTPS.
 BASE_URL = "http://emu.jy6d.com/dz/"
 
+# The index page (list of systems) rarely changes; reuse a cached copy for this long.
+INDEX_CACHE_TTL = 24 * 3600
+
+# Whitespace in a table cell that needs rewriting: a line break plus any whitespace after
+# it, a run of 2+ spaces/tabs, or a lone tab-like char. Single spaces are already clean.
+_RE_CELL_WS = re.compile(r"[\r\n]\s*|[ \t\f\v]{2,}|[\t\f\v]")
+_RE_TAG = re.compile(r"<.*?>")
+_RE_WS = re.compile(r"\s+")
+# System links: absolute-ish href="/dz/psp/" (group 1 set) or relative href="psp".
+# The title is captured in a lookahead so an unclosed <a> can't swallow the next link.
+_RE_HREF = re.compile(r"href=\"(/dz/)?([a-z0-9]+)/?\"(?=[^>]*>(.*?)</a>)", re.IGNORECASE | re.DOTALL)
+_RE_DZ_PATH = re.compile(r"/dz/([a-z0-9]+?)/", re.IGNORECASE)
+
+
+_LOG_LOCK = threading.Lock()
+
 
 def _log(msg: str, *, verbose: bool = True) -> None:
     if not verbose:
         return
-    print(msg, flush=True)
+    # Systems are scraped from several threads; keep lines from interleaving.
+    with _LOG_LOCK:
+        print(msg, flush=True)
+
+
+class _Throttle:
+    """Space out HTTP requests by at least `interval` seconds across all worker threads."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> float:
+        if self._interval <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        pause = start - now
+        if pause > 0:
+            time.sleep(pause)
+        return pause
+
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+
+# Keep-alive connections, one per (scheme, netloc) per thread: http.client connections
+# are not thread-safe and systems are scraped from a thread pool.
+_CONNS = threading.local()
+
+
+def _drop_conn(key: Tuple[str, str]) -> None:
+    conns: Dict[Tuple[str, str], http.client.HTTPConnection] = getattr(_CONNS, "conns", {})
+    conn = conns.pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def _fetch_pooled(url: str, parts: urllib.parse.SplitResult, headers: Dict[str, str], timeout: int) -> Optional[bytes]:
+    # GET over the cached keep-alive connection; None means "use urlopen instead".
+    key = (parts.scheme, parts.netloc)
+    conns = getattr(_CONNS, "conns", None)
+    if conns is None:
+        conns = _CONNS.conns = {}
+    conn = conns.get(key)
+    if conn is None:
+        cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = conns[key] = cls(parts.netloc, timeout=timeout)
+
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    try:
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+    except socket.timeout as e:
+        # Same as urlopen: errors before the response arrives surface as URLError.
+        _drop_conn(key)
+        raise urllib.error.URLError(e)
+    except (http.client.HTTPException, OSError):
+        # Usually a keep-alive socket the server closed; retry via urlopen.
+        _drop_conn(key)
+        return None
+
+    try:
+        raw = resp.read()
+    except socket.timeout:
+        # Also as with urlopen, a timeout while reading the body is raised as-is.
+        _drop_conn(key)
+        raise
+    except (http.client.HTTPException, OSError):
+        _drop_conn(key)
+        return None
+
+    if resp.will_close:
+        _drop_conn(key)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(raw))
+    if resp.status >= 300:
+        # Let urlopen follow the redirect.
+        return None
+    return raw
+
+
+def _fetch(url: str, *, accept: str, timeout: int) -> bytes:
+    """GET `url` over a reused keep-alive connection.
+
+    Falls back to urllib.request.urlopen for redirects, proxies, non-HTTP schemes and
+    connections the server has already closed. Errors match urlopen's: HTTP errors
+    are urllib.error.HTTPError, connect/request failures urllib.error.URLError.
+    """
+
+    headers = {"User-Agent": _USER_AGENT, "Accept": accept}
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme in ("http", "https") and not urllib.request.getproxies():
+        raw = _fetch_pooled(url, parts, headers, timeout)
+        if raw is not None:
+            return raw
+
+    req = urllib.request.Request(url, headers=headers, method="GET")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+_ACCEPT_HTML = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+
+def _is_utf8(raw: bytes) -> bool:
+    # Validate in chunks so large pages are not decoded into one big str just to check.
+    dec = codecs.getincrementaldecoder("utf-8")()
+    view = memoryview(raw)
+    step = 1 << 16
+    try:
+        for i in range(0, len(view), step):
+            dec.decode(view[i:i + step])
+        dec.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _decode_html(raw: bytes) -> str:
+    # Try a couple common encodings; default to utf-8.
+    for enc in ("utf-8", "gb18030"):
+        try:
+            return raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")
 
 
 def _http_get(
@@ -54,62 +214,36 @@ def _http_get(
     retries: int = 2,
     verbose: bool = True,
 ) -> str:
-    last_err: Optional[Exception] = None
-    for attempt in range(1, retries + 2):
-        try:
-            _log(f"[HTTP] GET {url} (attempt {attempt}/{retries + 1})", verbose=verbose)
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                },
-                method="GET",
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                # Try a couple common encodings; default to utf-8.
-                raw = resp.read()
-                _log(f"[HTTP] {len(raw)} bytes", verbose=verbose)
-                for enc in ("utf-8", "gb18030"):
-                    try:
-                        return raw.decode(enc)
-                    except UnicodeDecodeError:
-                        continue
-                return raw.decode("utf-8", errors="replace")
-        except Exception as e:
-            last_err = e
-            _log(f"[HTTP] error: {e}", verbose=verbose)
-            if attempt < retries + 1:
-                time.sleep(0.8)
-            continue
-
-    assert last_err is not None
-    raise last_err
+    raw = _http_get_bytes(
+        url,
+        accept=_ACCEPT_HTML,
+        timeout=timeout,
+        retries=retries,
+        verbose=verbose,
+    )
+    return _decode_html(raw)
 
 
 def _http_get_bytes(
     url: str,
     *,
+    accept: str = "*/*",
     timeout: int = 30,
     retries: int = 2,
     verbose: bool = True,
+    throttle: Optional[_Throttle] = None,
 ) -> bytes:
     last_err: Optional[Exception] = None
     for attempt in range(1, retries + 2):
+        if throttle is not None:
+            pause = throttle.wait()
+            if pause > 0:
+                _log(f"[SLEEP] {pause:.2f}s", verbose=verbose)
         try:
             _log(f"[HTTP] GET {url} (attempt {attempt}/{retries + 1})", verbose=verbose)
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
-                    "Accept": "*/*",
-                },
-                method="GET",
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                raw = resp.read()
-                _log(f"[HTTP] {len(raw)} bytes", verbose=verbose)
-                return raw
+            raw = _fetch(url, accept=accept, timeout=timeout)
+            _log(f"[HTTP] {len(raw)} bytes", verbose=verbose)
+            return raw
         except Exception as e:
             last_err = e
             _log(f"[HTTP] error: {e}", verbose=verbose)
@@ -131,12 +265,48 @@ def _decode_text(raw: bytes) -> str:
     return raw.decode("utf-8", errors="replace")
 
 
+class _EndpointCache:
+    """Last JSON filename that worked per system key, persisted across runs.
+
+    Stored as {system_key: filename} so repeated runs request the known-good
+    endpoint first instead of probing candidates that 404.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, str] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            self._data = {str(k): str(v) for k, v in data.items()}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, filename: str) -> None:
+        with self._lock:
+            if self._data.get(key) == filename:
+                return
+            self._data[key] = filename
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(
+                json.dumps(self._data, ensure_ascii=False, indent=2, sort_keys=True),
+                encoding="utf-8",
+            )
+
+
 def _try_fetch_system_json(
     system: SystemLink,
     *,
     timeout: int,
     retries: int,
     verbose: bool,
+    endpoint_cache: Optional[_EndpointCache] = None,
+    throttle: Optional[_Throttle] = None,
 ) -> Optional[Tuple[List[str], List[List[str]]]]:
     # Observed JSON endpoints are not fully consistent.
     # Most: {system}/{system}.json
@@ -150,17 +320,23 @@ def _try_fetch_system_json(
 
     base = system.url if system.url.endswith("/") else system.url + "/"
     candidates = []
+    cached = endpoint_cache.get(system.key) if endpoint_cache is not None else None
+    if cached:
+        candidates.append(cached)
     if system.key in overrides:
         candidates.append(overrides[system.key])
     candidates.append(f"{system.key}.json")
+    candidates = list(dict.fromkeys(candidates))
 
     raw: Optional[bytes] = None
     json_url: Optional[str] = None
     for fname in candidates:
         u = urllib.parse.urljoin(base, fname)
         try:
-            raw = _http_get_bytes(u, timeout=timeout, retries=retries, verbose=verbose)
+            raw = _http_get_bytes(u, timeout=timeout, retries=retries, verbose=verbose, throttle=throttle)
             json_url = u
+            if endpoint_cache is not None:
+                endpoint_cache.set(system.key, fname)
             break
         except urllib.error.HTTPError as e:
             if e.code == 404:
@@ -216,13 +392,27 @@ def _try_fetch_system_json(
     return (headers, rows)
 
 
+def _cell_ws_repl(m: re.Match) -> str:
+    return "\n" if m.group()[0] in "\r\n" else " "
+
+
+def _clean_cell(cell: str) -> str:
+    # Collapse spaces/tabs but keep newlines (one pass, no intermediate strings)
+    return _RE_CELL_WS.sub(_cell_ws_repl, cell).strip()
+
+
 class _TableExtractor(HTMLParser):
+    # Only rows and cells of outermost tables are collected; anything inside a nested
+    # <table> (rows, cells and text) is ignored, like the lxml path.
+
     def __init__(self) -> None:
         super().__init__()
         self._in_table = 0
         self._in_tr = False
         self._in_cell = False
-        self._cell_parts: List[str] = []
+        # Most cells hold a single text node: keep it as a plain str and only switch
+        # to a list once a second fragment arrives.
+        self._cell_parts: Union[None, str, List[str]] = None
         self._current_row: List[str] = []
         self.tables: List[List[List[str]]] = []
         self._current_table: List[List[str]] = []
@@ -233,55 +423,158 @@ class _TableExtractor(HTMLParser):
             if self._in_table == 1:
                 self._current_table = []
 
-        if self._in_table > 0 and tag == "tr":
+        if self._in_table != 1:
+            return
+
+        if tag == "tr":
             self._in_tr = True
             self._current_row = []
 
-        if self._in_table > 0 and self._in_tr and tag in ("td", "th"):
+        if self._in_tr and tag in ("td", "th"):
             self._in_cell = True
-            self._cell_parts = []
+            self._cell_parts = None
 
         # Preserve line breaks in cells for pages that pack many entries into one <td>
         if self._in_cell and tag == "br":
-            self._cell_parts.append("\n")
+            self._cell_append("\n")
 
         # Many pages use <p> blocks for each entry; treat them as line breaks.
         if self._in_cell and tag == "p":
-            # Avoid leading blank line
-            if self._cell_parts and not self._cell_parts[-1].endswith("\n"):
-                self._cell_parts.append("\n")
+            self._cell_break()
 
     def handle_endtag(self, tag: str):
+        if tag == "table" and self._in_table > 0:
+            self._in_table -= 1
+            if self._in_table == 0:
+                if self._current_table:
+                    self.tables.append(self._current_table)
+                self._current_table = []
+            return
+
+        if self._in_table != 1:
+            return
+
         if self._in_cell and tag == "p":
-            if self._cell_parts and not self._cell_parts[-1].endswith("\n"):
-                self._cell_parts.append("\n")
+            self._cell_break()
 
-        if self._in_table > 0 and self._in_tr and tag in ("td", "th"):
+        if self._in_tr and tag in ("td", "th"):
             self._in_cell = False
-            cell = "".join(self._cell_parts)
-            cell = cell.replace("\r\n", "\n").replace("\r", "\n")
-            # Collapse spaces/tabs but keep newlines
-            cell = re.sub(r"[ \t\f\v]+", " ", cell)
-            cell = re.sub(r"\n\s+", "\n", cell)
-            cell = cell.strip()
-            self._current_row.append(cell)
-
-        if self._in_table > 0 and tag == "tr":
+            parts = self._cell_parts
+            if parts is None:
+                cell = ""
+            elif isinstance(parts, str):
+                cell = parts
+            else:
+                cell = "".join(parts)
+            self._current_row.append(_clean_cell(cell))
+
+        if tag == "tr":
             self._in_tr = False
             if any(c.strip() for c in self._current_row):
                 self._current_table.append(self._current_row)
             self._current_row = []
 
-        if tag == "table" and self._in_table > 0:
-            self._in_table -= 1
-            if self._in_table == 0:
-                if self._current_table:
-                    self.tables.append(self._current_table)
-                self._current_table = []
-
     def handle_data(self, data: str):
-        if self._in_cell:
-            self._cell_parts.append(data)
+        if self._in_cell and self._in_table == 1:
+            # Inlined _cell_append: this is the hot path.
+            parts = self._cell_parts
+            if parts is None:
+                self._cell_parts = data
+            elif isinstance(parts, str):
+                self._cell_parts = [parts, data]
+            else:
+                parts.append(data)
+
+    def _cell_append(self, text: str) -> None:
+        parts = self._cell_parts
+        if parts is None:
+            self._cell_parts = text
+        elif isinstance(parts, str):
+            self._cell_parts = [parts, text]
+        else:
+            parts.append(text)
+
+    def _cell_break(self) -> None:
+        # Add a line break unless the cell is still empty (avoids a leading blank line)
+        # or already ends with one.
+        parts = self._cell_parts
+        last = parts if isinstance(parts, str) else (parts[-1] if parts else None)
+        if last is not None and not last.endswith("\n"):
+            self._cell_append("\n")
+
+
+def _lxml_cell_parts(el, parts: List[str]) -> None:
+    # Mirror _TableExtractor: <br> is a line break, <p> blocks are separated by one.
+    # Text of nested tables is not part of the enclosing cell.
+    if el.text:
+        parts.append(el.text)
+    for child in el:
+        tag = child.tag.lower() if isinstance(child.tag, str) else None
+        if tag == "br":
+            parts.append("\n")
+        elif tag == "p" and parts and not parts[-1].endswith("\n"):
+            parts.append("\n")
+        if tag is not None and tag != "table":
+            _lxml_cell_parts(child, parts)
+        if tag == "p" and parts and not parts[-1].endswith("\n"):
+            parts.append("\n")
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _lxml_table_rows(tbl) -> List[List[str]]:
+    rows: List[List[str]] = []
+    for tr in tbl.iter("tr"):
+        # Rows of nested tables are skipped; only tbl's own rows count.
+        if next(tr.iterancestors("table"), None) is not tbl:
+            continue
+        row: List[str] = []
+        for cell_el in tr:
+            if cell_el.tag not in ("td", "th"):
+                continue
+            parts: List[str] = []
+            _lxml_cell_parts(cell_el, parts)
+            row.append(_clean_cell("".join(parts)))
+        if any(c.strip() for c in row):
+            rows.append(row)
+    return rows
+
+
+def _extract_tables_lxml(raw: bytes) -> List[List[List[str]]]:
+    # Stream-parse the undecoded page and drop each table once its rows are extracted,
+    # so neither the decoded text nor the whole tree has to be held at once.
+    encoding = "utf-8" if _is_utf8(raw) else "gb18030"
+    tables: List[List[List[str]]] = []
+    for _, tbl in _lxml_etree.iterparse(
+        io.BytesIO(raw),
+        events=("end",),
+        tag="table",
+        html=True,
+        encoding=encoding,
+    ):
+        # Nested tables are ignored (see _lxml_table_rows), as in _TableExtractor; leave
+        # them in place until their outer table ends.
+        if next(tbl.iterancestors("table"), None) is not None:
+            continue
+        rows = _lxml_table_rows(tbl)
+        if rows:
+            tables.append(rows)
+        tbl.clear()
+        while tbl.getprevious() is not None:
+            del tbl.getparent()[0]
+    return tables
+
+
+def _extract_tables(raw: bytes) -> List[List[List[str]]]:
+    if _lxml_etree is not None:
+        try:
+            return _extract_tables_lxml(raw)
+        except (_lxml_etree.ParserError, _lxml_etree.XMLSyntaxError, ValueError):
+            # e.g. empty documents; let the stdlib parser have a go
+            pass
+    parser = _TableExtractor()
+    parser.feed(_decode_html(raw))
+    return parser.tables
 
 
 def _expand_single_cell_rows(headers: List[str], rows: List[List[str]]) -> List[List[str]]:
@@ -340,6 +633,8 @@ def _expand_two_column_paired_rows(headers: List[str], rows: List[List[str]]) ->
 
 
 _RE_CJK = re.compile(r"[\u4e00-\u9fff]")
+# ASCII token running up to the end of the searched span (used with endpos).
+_RE_ASCII_TOKEN = re.compile(r"[A-Za-z0-9&._+\-]+\Z")
 
 
 def _split_cn_en_pair(s: str) -> Tuple[str, str]:
@@ -350,7 +645,7 @@ def _split_cn_en_pair(s: str) -> Tuple[str, str]:
     Heuristic: the Chinese part starts at the first CJK character.
     """
 
-    ss = re.sub(r"\s+", " ", (s or "").strip())
+    ss = _RE_WS.sub(" ", (s or "").strip())
     if not ss:
         return ("", "")
 
@@ -363,9 +658,10 @@ def _split_cn_en_pair(s: str) -> Tuple[str, str]:
     # If an ASCII token is directly attached to the first CJK char (e.g. "EA..."),
     # treat that token as part of the Chinese name.
     # Example: "EA Hockey League (U) EA..." -> english="EA Hockey League (U)", chinese="EA..."
-    j = i
-    while j > 0 and ss[j - 1].isascii() and re.match(r"[A-Za-z0-9&._+\-]", ss[j - 1]):
-        j -= 1
+    # Only tokens of up to 4 chars qualify, so a 5-char window is enough to tell and
+    # keeps the search from retrying at every position of the English part.
+    m2 = _RE_ASCII_TOKEN.search(ss, max(0, i - 5), i)
+    j = m2.start() if m2 else i
     token = ss[j:i]
     if j < i and token and token.isupper() and len(token) <= 4 and (j == 0 or ss[j - 1] == " "):
         i = j
@@ -414,50 +710,86 @@ def _extract_system_links(index_html: str, base_url: str) -> List[SystemLink]:
     # Observed formats:
     # - href="/dz/psp/"
     # - href="psp" / href="psp/" (relative to /dz/)
-    links: List[SystemLink] = []
-
-    # Absolute-ish paths under /dz/
-    for m in re.finditer(
-        r"href=\"(/dz/([a-z0-9]+?)/?)\"[^>]*>(.*?)</a>",
-        index_html,
-        re.IGNORECASE | re.DOTALL,
-    ):
-        href = m.group(1)
+    # Both formats are collected in one pass; absolute links take precedence
+    # over relative ones for the same key.
+    absolute: List[SystemLink] = []
+    relative: List[SystemLink] = []
+    seen_abs: Set[str] = set()
+    seen_rel: Set[str] = set()
+    # End of the last matched title per kind: a link inside an earlier link's title of
+    # the same kind is skipped, as the former separate per-kind scans did.
+    abs_end = 0
+    rel_end = 0
+
+    for m in _RE_HREF.finditer(index_html):
         key = m.group(2).lower()
-        title = re.sub(r"<.*?>", "", m.group(3))
-        title = re.sub(r"\s+", " ", title).strip()
+        if m.group(1):
+            if m.start() < abs_end:
+                continue
+            abs_end = m.end(3) + len("</a>")
+            if key in seen_abs:
+                continue
+            seen_abs.add(key)
+            target = absolute
+        else:
+            if m.start() < rel_end:
+                continue
+            rel_end = m.end(3) + len("</a>")
+            if key in seen_rel:
+                continue
+            # Avoid non-system nav links
+            if key in ("javascript", "all", "jd", "quanji", "class", "dz", "article", "list"):
+                continue
+            seen_rel.add(key)
+            target = relative
+        title = _RE_TAG.sub("", m.group(3))
+        title = _RE_WS.sub(" ", title).strip()
         # Normalize to /dz/{key}/
         url = urllib.parse.urljoin(base_url, f"{key}/")
-        if key and url and all(l.key != key for l in links):
-            links.append(SystemLink(key=key, url=url, title=title))
+        target.append(SystemLink(key=key, url=url, title=title))
 
-    # Relative links like href="psp" (common on this site)
-    for m in re.finditer(r"href=\"([a-z0-9]+)(/?)\"[^>]*>(.*?)</a>", index_html, re.IGNORECASE | re.DOTALL):
-        key = m.group(1).lower()
-        if key in ("javascript", "#"):
-            continue
-        # Avoid non-system nav links
-        if key in ("all", "jd", "quanji", "class", "dz", "article", "list"):
-            continue
-        title = re.sub(r"<.*?>", "", m.group(3))
-        title = re.sub(r"\s+", " ", title).strip()
-        url = urllib.parse.urljoin(base_url, f"{key}/")
-        if key and url and all(l.key != key for l in links):
-            links.append(SystemLink(key=key, url=url, title=title))
+    links = absolute + [l for l in relative if l.key not in seen_abs]
 
     # Fallback: sometimes links are not wrapped as above; also accept plain /dz/{key}/ occurrences.
     if not links:
-        for m in re.finditer(r"/dz/([a-z0-9]+?)/", index_html, re.IGNORECASE):
+        seen: Set[str] = set()
+        for m in _RE_DZ_PATH.finditer(index_html):
             key = m.group(1).lower()
+            if key in seen:
+                continue
+            seen.add(key)
             url = urllib.parse.urljoin(base_url, f"{key}/")
-            if key and all(l.key != key for l in links):
-                links.append(SystemLink(key=key, url=url, title=key))
+            links.append(SystemLink(key=key, url=url, title=key))
 
     # Filter obvious non-system pages
     links = [l for l in links if l.key not in ("dz", "all", "index")]
     return links
 
 
+def _index_cache_header(base_url: str) -> str:
+    return f"<!-- index of {base_url} -->"
+
+
+def _read_index_cache(path: Path, base_url: str) -> Optional[Tuple[str, float]]:
+    """Return (html, age_seconds) of the cached index page for base_url, if any."""
+
+    try:
+        text = path.read_text(encoding="utf-8")
+        age = time.time() - path.stat().st_mtime
+    except (OSError, ValueError):
+        # Missing, unreadable or not valid UTF-8: treat as a cache miss.
+        return None
+    header, _, html = text.partition("\n")
+    if header != _index_cache_header(base_url):
+        return None
+    return (html, age)
+
+
+def _write_index_cache(path: Path, base_url: str, html: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_index_cache_header(base_url) + "\n" + html, encoding="utf-8")
+
+
 def _pick_main_table(tables: List[List[List[str]]]) -> Optional[List[List[str]]]:
     if not tables:
         return None
@@ -501,7 +833,8 @@ def scrape_system(
     system: SystemLink,
     outdir: Path,
     *,
-    delay: float = 0.2,
+    throttle: Optional[_Throttle] = None,
+    endpoint_cache: Optional[_EndpointCache] = None,
     timeout: int = 30,
     retries: int = 2,
     verbose: bool = True,
@@ -509,16 +842,29 @@ def scrape_system(
     _log(f"[SCRAPE] system={system.key} title={system.title}", verbose=verbose)
 
     # Prefer JSON endpoint (fast + complete). Fallback to HTML table.
-    json_result = _try_fetch_system_json(system, timeout=timeout, retries=retries, verbose=verbose)
+    json_result = _try_fetch_system_json(
+        system,
+        timeout=timeout,
+        retries=retries,
+        verbose=verbose,
+        endpoint_cache=endpoint_cache,
+        throttle=throttle,
+    )
     if json_result is not None:
         headers, rows = json_result
     else:
-        html = _http_get(system.url, timeout=timeout, retries=retries, verbose=verbose)
-        parser = _TableExtractor()
-        parser.feed(html)
-        _log(f"[PARSE] found {len(parser.tables)} <table> elements", verbose=verbose)
+        raw = _http_get_bytes(
+            system.url,
+            accept=_ACCEPT_HTML,
+            timeout=timeout,
+            retries=retries,
+            verbose=verbose,
+            throttle=throttle,
+        )
+        tables = _extract_tables(raw)
+        _log(f"[PARSE] found {len(tables)} <table> elements", verbose=verbose)
 
-        table = _pick_main_table(parser.tables)
+        table = _pick_main_table(tables)
         if table is None:
             raise RuntimeError(f"No table found for {system.key} ({system.url})")
 
@@ -536,10 +882,13 @@ def scrape_system(
     with out_path.open("w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
         w.writerow(["system", *headers])
-        for idx, r in enumerate(rows, 1):
-            w.writerow([system.key, *r])
-            if verbose and idx % 5000 == 0:
-                _log(f"[WRITE] {system.key}.csv wrote {idx}/{len(rows)} rows...", verbose=True)
+        # Write in chunks so csv's C loop does the work while progress is still reported.
+        for start in range(0, len(rows), 5000):
+            chunk = rows[start:start + 5000]
+            w.writerows([system.key, *r] for r in chunk)
+            done = start + len(chunk)
+            if verbose and done % 5000 == 0:
+                _log(f"[WRITE] {system.key}.csv wrote {done}/{len(rows)} rows...", verbose=True)
 
     # Also emit a lightweight JSON alongside for programmatic use.
     json_path = outdir / f"{system.key}.json"
@@ -558,10 +907,6 @@ def scrape_system(
 
     _log(f"[OUT] {out_path}", verbose=verbose)
     _log(f"[OUT] {json_path}", verbose=verbose)
-
-    if delay:
-        _log(f"[SLEEP] {delay:.2f}s", verbose=verbose)
-        time.sleep(delay)
     return out_path
 
 
@@ -572,9 +917,11 @@ def main() -> int:
     ap.add_argument("--list", action="store_true", help="list available systems")
     ap.add_argument("--system", action="append", help="system key to scrape (repeatable)")
     ap.add_argument("--all", action="store_true", help="scrape all systems")
-    ap.add_argument("--delay", type=float, default=0.2, help="delay between requests")
+    ap.add_argument("--delay", type=float, default=0.2, help="minimum delay between HTTP requests (shared by all workers)")
+    ap.add_argument("--workers", type=int, default=4, help="systems to scrape concurrently")
     ap.add_argument("--timeout", type=int, default=30, help="HTTP timeout seconds")
     ap.add_argument("--retries", type=int, default=2, help="HTTP retries")
+    ap.add_argument("--refresh-index", action="store_true", help="ignore the cached index page and fetch it again")
     ap.add_argument("--quiet", action="store_true", help="less output")
     args = ap.parse_args()
 
@@ -586,16 +933,39 @@ def main() -> int:
     if not base_url.endswith("/"):
         base_url += "/"
 
-    try:
-        index_html = _http_get(
-            base_url,
-            timeout=args.timeout,
-            retries=args.retries,
-            verbose=verbose,
-        )
-    except urllib.error.URLError as e:
-        print(f"Failed to fetch index page: {e}", file=sys.stderr)
-        return 2
+    # For --system runs, reuse the cached index page (whatever its age) only if it lists
+    # every requested key; otherwise reuse it while it is fresh.
+    index_cache = outdir / ".index.cache.html"
+    cached = None if args.refresh_index else _read_index_cache(index_cache, base_url)
+    index_html: Optional[str] = None
+    if cached is not None:
+        html, age = cached
+        wanted_keys = [k.strip().lower() for k in args.system or []]
+        if wanted_keys and not args.all and not args.list:
+            known = {l.key for l in _extract_system_links(html, base_url)}
+            if all(k in known for k in wanted_keys):
+                index_html = html
+        elif age < INDEX_CACHE_TTL:
+            index_html = html
+        if index_html is not None:
+            _log(f"[INDEX] using cached {index_cache} (age {age / 3600:.1f}h)", verbose=verbose)
+
+    if index_html is None:
+        try:
+            index_html = _http_get(
+                base_url,
+                timeout=args.timeout,
+                retries=args.retries,
+                verbose=verbose,
+            )
+        except urllib.error.URLError as e:
+            print(f"Failed to fetch index page: {e}", file=sys.stderr)
+            return 2
+        try:
+            _write_index_cache(index_cache, base_url, index_html)
+        except OSError as e:
+            # The cache is only an optimization; e.g. a read-only outdir must not fail the run.
+            _log(f"[INDEX] warning: could not write {index_cache}: {e}", verbose=verbose)
 
     systems = _extract_system_links(index_html, base_url)
     if not systems:
@@ -629,21 +999,40 @@ def main() -> int:
     ok = 0
     _log(f"[INFO] scraping {len(wanted)} system(s) -> {outdir}", verbose=verbose)
 
-    for idx, s in enumerate(wanted, 1):
-        try:
-            _log(f"\n[{idx}/{len(wanted)}] start {s.key}", verbose=verbose)
-            out = scrape_system(
+    throttle = _Throttle(args.delay)
+    endpoint_cache = _EndpointCache(outdir / ".json_endpoint_cache.json")
+    workers = max(1, min(args.workers, len(wanted)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                scrape_system,
                 s,
                 outdir,
-                delay=args.delay,
+                throttle=throttle,
+                endpoint_cache=endpoint_cache,
                 timeout=args.timeout,
                 retries=args.retries,
                 verbose=verbose,
-            )
-            print(f"OK  {s.key} -> {out}")
-            ok += 1
-        except Exception as e:
-            print(f"ERR {s.key}: {e}", file=sys.stderr)
+            ): s
+            for s in wanted
+        }
+        try:
+            for idx, fut in enumerate(as_completed(futures), 1):
+                s = futures[fut]
+                try:
+                    out = fut.result()
+                    with _LOG_LOCK:
+                        print(f"OK  {s.key} -> {out}")
+                    ok += 1
+                except Exception as e:
+                    with _LOG_LOCK:
+                        print(f"ERR {s.key}: {e}", file=sys.stderr)
+                _log(f"[{idx}/{len(wanted)}] finished {s.key}", verbose=verbose)
+        except BaseException:
+            # Ctrl-C (or any other escape): drop the queued scrapes instead of
+            # letting the executor's __exit__ run them all before we can exit.
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
 
     print(f"Done. {ok}/{len(wanted)} succeeded.")
     return 0 if ok == len(wanted) else 1